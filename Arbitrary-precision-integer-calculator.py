@@ -1,301 +1,1030 @@
-class BigInt:
-    def __init__(self, value=0, base=10):
-        self.base = base
-        self.digits = []
-        if isinstance(value, int):
-            if value == 0:
-                self.digits = [0]
-            else:
-                while value > 0:
-                    self.digits.append(value % base)
-                    value //= base
-                self.digits.reverse()
-        elif isinstance(value, str):
-            self.from_str(value, base)
-        elif isinstance(value, list):
-            # Allow initialization from a list of digits
-            self.digits = value
-        
-        self._validate_digits()
-
-    def _validate_digits(self):
-        """Validate that all digits are within the base range."""
-        for digit in self.digits:
-            if digit < 0 or digit >= self.base:
-                raise ValueError(f"Digit {digit} is out of range for base {self.base}")
-
-    def from_str(self, value, base=10):
-        self.base = base
-        self.digits = []
-        value = value.strip()
-        
-        # Handle negative numbers
-        sign = 1
-        if value.startswith('-'):
-            sign = -1
-            value = value[1:]
-        
-        if value == '0':
-            self.digits = [0]
-        else:
-            for char in value:
-                self.digits.append(int(char, base))
-        
-        if sign == -1:
-            self.digits = [-d for d in self.digits]
-
-    def __str__(self):
-        # Handle negative numbers in string representation
-        if self.digits and self.digits[0] < 0:
-            return '-' + ''.join(str(abs(digit)) for digit in self.digits)
-        return ''.join(str(abs(digit)) for digit in self.digits)
-
-    def __repr__(self):
-        return f"BigInt({str(self)})"
-
-    def to_int(self):
-        result = 0
-        for digit in self.digits:
-            result = result * self.base + abs(digit)
-        return result * (1 if self.digits[0] >= 0 else -1)
-
-    def _normalize(self):
-        """Remove leading zeros."""
-        while len(self.digits) > 1 and self.digits[0] == 0:
-            self.digits.pop(0)
-
-    def __abs__(self):
-        """Return the absolute value of the BigInt."""
-        result = BigInt()
-        result.digits = [abs(d) for d in self.digits]
-        result.base = self.base
-        return result
-
-    def __neg__(self):
-        """Return the negation of the BigInt."""
-        result = BigInt()
-        result.digits = [-d for d in self.digits]
-        result.base = self.base
-        return result
-
-    def __add__(self, other):
-        # Handle different sign scenarios
-        if self.digits[0] < 0 and other.digits[0] >= 0:
-            return other - abs(self)
-        elif self.digits[0] >= 0 and other.digits[0] < 0:
-            return self - abs(other)
-        
-        sign = 1 if self.digits[0] >= 0 else -1
-        carry = 0
-        result_digits = []
-        a_digits = [abs(d) for d in self.digits[::-1]]
-        b_digits = [abs(d) for d in other.digits[::-1]]
-        max_len = max(len(a_digits), len(b_digits))
-        
-        for i in range(max_len):
-            a_digit = a_digits[i] if i < len(a_digits) else 0
-            b_digit = b_digits[i] if i < len(b_digits) else 0
-            total = a_digit + b_digit + carry
-            carry = total // self.base
-            result_digits.append(total % self.base)
-        
-        if carry:
-            result_digits.append(carry)
-
-        result_digits.reverse()
-        result = BigInt()
-        result.digits = [sign * d for d in result_digits]
-        result._normalize()
-        return result
-
-    def __sub__(self, other):
-        # Handle different sign scenarios
-        if self.digits[0] < 0 and other.digits[0] < 0:
-            return abs(other) - abs(self)
-        elif self.digits[0] < 0:
-            return -abs(self) - other
-        elif other.digits[0] < 0:
-            return self + abs(other)
-        
-        # Ensure first number is larger
-        if abs(self) < abs(other):
-            result = other - self
-            result.digits = [-d for d in result.digits]
-            return result
-        
-        borrow = 0
-        result_digits = []
-        a_digits = self.digits[::-1]
-        b_digits = other.digits[::-1]
-        max_len = max(len(a_digits), len(b_digits))
-        
-        for i in range(max_len):
-            a_digit = a_digits[i] if i < len(a_digits) else 0
-            b_digit = b_digits[i] if i < len(b_digits) else 0
-            total = a_digit - b_digit - borrow
-            if total < 0:
-                total += self.base
-                borrow = 1
-            else:
-                borrow = 0
-            result_digits.append(total)
-        
-        result_digits.reverse()
-        result = BigInt()
-        result.digits = result_digits
-        result._normalize()
-        return result
-
-    def __mul__(self, other):
-        # Multiply BigInt * BigInt
-        sign = 1
-        if self.digits[0] < 0:
-            sign *= -1
-        if other.digits[0] < 0:
-            sign *= -1
-        
-        result_digits = [0] * (len(self.digits) + len(other.digits))
-        a_digits = [abs(d) for d in self.digits]
-        b_digits = [abs(d) for d in other.digits]
-        
-        for i in range(len(a_digits) - 1, -1, -1):
-            carry = 0
-            for j in range(len(b_digits) - 1, -1, -1):
-                mul = a_digits[i] * b_digits[j] + result_digits[i + j + 1] + carry
-                carry = mul // self.base
-                result_digits[i + j + 1] = mul % self.base
-            result_digits[i + j] = carry
-
-        result = BigInt()
-        result.digits = [sign * d for d in result_digits]
-        result._normalize()
-        return result
-
-    def __floordiv__(self, other):
-        # Check for division by zero
-        if other.to_int() == 0:
-            raise ZeroDivisionError("Division by zero")
-        
-        # Handle sign
-        sign = 1
-        if self.digits[0] < 0:
-            sign *= -1
-        if other.digits[0] < 0:
-            sign *= -1
-        
-        dividend = [abs(d) for d in self.digits]
-        divisor = [abs(d) for d in other.digits]
-        quotient = []
-        
-        # Long division algorithm
-        remainder = []
-        for digit in dividend:
-            remainder.append(digit)
-            while len(remainder) > 1 and remainder[0] == 0:
-                remainder.pop(0)
-            count = 0
-            while _list_compare(remainder, divisor) >= 0:
-                remainder = _list_subtract(remainder, divisor)
-                count += 1
-            quotient.append(count)
-        
-        result = BigInt()
-        result.digits = [sign * d for d in quotient]
-        result._normalize()
-        return result
-
-    def __mod__(self, other):
-        # Check for modulo by zero
-        if other.to_int() == 0:
-            raise ZeroDivisionError("Modulo by zero")
-        
-        # Determine sign
-        sign = 1 if self.digits[0] >= 0 else -1
-        
-        dividend = [abs(d) for d in self.digits]
-        divisor = [abs(d) for d in other.digits]
-        
-        # Long division algorithm to get remainder
-        remainder = []
-        for digit in dividend:
-            remainder.append(digit)
-            while len(remainder) > 1 and remainder[0] == 0:
-                remainder.pop(0)
-            while _list_compare(remainder, divisor) >= 0:
-                remainder = _list_subtract(remainder, divisor)
-        
-        result = BigInt()
-        result.digits = [sign * d for d in remainder]
-        result._normalize()
-        return result
-
-    def factorial(self):
-        # Factorial implementation
-        if self.to_int() < 0:
-            raise ValueError("Factorial is not defined for negative numbers")
-        
-        if self.to_int() <= 1:
-            return BigInt(1)
-        
-        result = BigInt(1)
-        current = BigInt(1)
-        
-        while current.to_int() <= self.to_int():
-            result *= current
-            current += BigInt(1)
-        
-        return result
-
-def _list_compare(a, b):
-    """Compare two lists of digits lexicographically."""
-    if len(a) > len(b):
-        return 1
-    elif len(a) < len(b):
-        return -1
-    
-    for x, y in zip(a, b):
-        if x > y:
-            return 1
-        elif x < y:
-            return -1
-    return 0
-
-def _list_subtract(a, b):
-    """Subtract two lists of digits."""
-    a = a[::-1]
-    b = b[::-1]
-    result = []
-    borrow = 0
-    
-    for i in range(max(len(a), len(b))):
-        x = a[i] if i < len(a) else 0
-        y = b[i] if i < len(b) else 0
-        total = x - y - borrow
-        
-        if total < 0:
-            total += 10  # Assuming base 10 for subtraction
-            borrow = 1
-        else:
-            borrow = 0
-        
-        result.append(total)
-    
-    while result and result[-1] == 0:
-        result.pop()
-    
-    return result[::-1] or [0]
-
-def repl():
-    print("Welcome to BigInt REPL! Type 'exit' to quit.")
-    while True:
-        expr = input(">> ")
-        if expr == 'exit':
-            break
-        try:
-            result = eval(expr)
-            print(f"Result: {result}")
-        except Exception as e:
-            print(f"Error: {e}")
-
-if __name__ == "__main__":
-    repl()
\ No newline at end of file
+import ctypes
+import ctypes.util
+import functools
+import math
+import os
+import sys
+from array import array
+
+try:
+    import numba
+    import numpy
+except ImportError:
+    numba = numpy = None
+
+BASE_BITS = 30
+BASE = 1 << BASE_BITS
+MASK = BASE - 1
+
+# Decimal digits packed per limb when converting to/from base-10 strings.
+DEC_CHUNK = 9
+DEC_CHUNK_BASE = 10 ** DEC_CHUNK
+
+DIGIT_CHARS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+# Combined operand size (in limbs) below which add/sub/mul just use native
+# int arithmetic on the (memoized) int values.
+SMALL_OP_LIMBS = 4
+
+# Smallest operand size (in limbs) at which Karatsuba beats schoolbook.
+KARATSUBA_THRESHOLD = 32
+# Smallest operand size (in limbs) at which Toom-3 beats Karatsuba.
+TOOM3_THRESHOLD = 256
+# Combined operand size (in limbs) above which Toom-3 sub-products are
+# farmed out to worker processes; below this, process overhead dominates.
+PARALLEL_THRESHOLD = 4096
+
+# Smallest operand size (in limbs) at which NTT multiplication beats Toom-3
+# (only relevant on the pure-Python path; the GMP bridge wins earlier).
+# Measured crossover is near 2000 limbs.
+NTT_THRESHOLD = 2048
+
+# NTT-friendly primes p = c * 2^k + 1 with their primitive roots; p1 * p2
+# comfortably exceeds the largest possible convolution coefficient
+# (n * (2^30 - 1)^2), so two residues CRT-combine exactly.
+_NTT_PRIMES = ((29 * 2 ** 57 + 1, 3), (27 * 2 ** 56 + 1, 5))
+
+# Native GMP bridge: when libgmp is available, multiplications and modular
+# exponentiations above GMP_THRESHOLD limbs go through mpz_* calls. With
+# nails=2 on 4-byte words, mpz_import/mpz_export speak our limb format
+# directly (30 data bits per 32-bit word, least significant word first).
+GMP_THRESHOLD = 128
+
+try:
+    _gmp = ctypes.CDLL(ctypes.util.find_library("gmp") or "libgmp.so.10")
+except OSError:
+    _gmp = None
+
+if _gmp is not None:
+    class _mpz_t(ctypes.Structure):
+        _fields_ = [("_mp_alloc", ctypes.c_int),
+                    ("_mp_size", ctypes.c_int),
+                    ("_mp_d", ctypes.c_void_p)]
+
+    _MPZ_PTR = ctypes.POINTER(_mpz_t)
+    _gmp.__gmpz_init.argtypes = [_MPZ_PTR]
+    _gmp.__gmpz_clear.argtypes = [_MPZ_PTR]
+    _gmp.__gmpz_mul.argtypes = [_MPZ_PTR, _MPZ_PTR, _MPZ_PTR]
+    _gmp.__gmpz_powm.argtypes = [_MPZ_PTR, _MPZ_PTR, _MPZ_PTR, _MPZ_PTR]
+    _gmp.__gmpz_sizeinbase.argtypes = [_MPZ_PTR, ctypes.c_int]
+    _gmp.__gmpz_sizeinbase.restype = ctypes.c_size_t
+    _gmp.__gmpz_import.argtypes = [
+        _MPZ_PTR, ctypes.c_size_t, ctypes.c_int, ctypes.c_size_t,
+        ctypes.c_int, ctypes.c_size_t, ctypes.c_char_p]
+    _gmp.__gmpz_export.argtypes = [
+        ctypes.c_void_p, ctypes.POINTER(ctypes.c_size_t), ctypes.c_int,
+        ctypes.c_size_t, ctypes.c_int, ctypes.c_size_t, _MPZ_PTR]
+    _gmp.__gmpz_export.restype = ctypes.c_void_p
+
+def _mpz_from_limbs(limbs):
+    """Import a little-endian magnitude limb list into a new mpz_t."""
+    z = _mpz_t()
+    _gmp.__gmpz_init(ctypes.byref(z))
+    buf = limbs if isinstance(limbs, array) else array('I', limbs)
+    _gmp.__gmpz_import(ctypes.byref(z), len(buf), -1, 4, 0, 2, buf.tobytes())
+    return z
+
+def _limbs_from_mpz(z):
+    """Export an mpz_t back to a little-endian magnitude limb list."""
+    bits = _gmp.__gmpz_sizeinbase(ctypes.byref(z), 2)
+    count = (bits + BASE_BITS - 1) // BASE_BITS
+    buf = (ctypes.c_uint32 * count)()
+    written = ctypes.c_size_t()
+    _gmp.__gmpz_export(buf, ctypes.byref(written), -1, 4, 0, 2,
+                       ctypes.byref(z))
+    return list(buf[:written.value]) or [0]
+
+def _gmp_mul(a, b):
+    """Multiply magnitude limb lists via GMP's mpz_mul."""
+    za, zb, zr = _mpz_from_limbs(a), _mpz_from_limbs(b), _mpz_from_limbs([0])
+    _gmp.__gmpz_mul(ctypes.byref(zr), ctypes.byref(za), ctypes.byref(zb))
+    result = _limbs_from_mpz(zr)
+    for z in (za, zb, zr):
+        _gmp.__gmpz_clear(ctypes.byref(z))
+    return result
+
+def _gmp_powm(base, exp, mod):
+    """Modular exponentiation of magnitude limb lists via mpz_powm."""
+    zb, ze, zm, zr = (_mpz_from_limbs(base), _mpz_from_limbs(exp),
+                      _mpz_from_limbs(mod), _mpz_from_limbs([0]))
+    _gmp.__gmpz_powm(ctypes.byref(zr), ctypes.byref(zb), ctypes.byref(ze),
+                     ctypes.byref(zm))
+    result = _limbs_from_mpz(zr)
+    for z in (zb, ze, zm, zr):
+        _gmp.__gmpz_clear(ctypes.byref(z))
+    return result
+
+# Worker-process pool for parallel Toom-3, created on first use. Guarded by
+# the parent pid so forked workers never spawn pools of their own.
+_POOL = None
+_MAIN_PID = os.getpid()
+
+def _get_pool():
+    global _POOL
+    if _POOL is None:
+        from concurrent.futures import ProcessPoolExecutor
+        _POOL = ProcessPoolExecutor()
+    return _POOL
+
+
+class BigInt:
+    def __init__(self, value=0, base=10):
+        self.base = base
+        self.sign = 1
+        self.limbs = []
+        self._int_cache = None
+        if isinstance(value, int):
+            if value < 0:
+                self.sign = -1
+                value = -value
+            self.limbs = _int_to_limbs(value)
+        elif isinstance(value, str):
+            self.from_str(value, base)
+        elif isinstance(value, list):
+            # Allow initialization from a list of magnitude limbs
+            # (little-endian)
+            self.limbs = value
+
+        self._validate_limbs()
+        # Canonical storage is a contiguous unsigned-32-bit array: 4 bytes
+        # per limb instead of a pointer to a 28-byte boxed int.
+        if not isinstance(self.limbs, array):
+            self.limbs = array('I', self.limbs)
+
+    def _validate_limbs(self):
+        """Validate that all limbs are within the limb base range."""
+        for limb in self.limbs:
+            if limb < 0 or limb >= BASE:
+                raise ValueError(f"Limb {limb} is out of range for base {BASE}")
+
+    def from_str(self, value, base=10):
+        self.base = base
+        self.sign = 1
+        self.limbs = []
+        value = value.strip()
+
+        # Handle negative numbers
+        if value.startswith('-'):
+            self.sign = -1
+            value = value[1:]
+
+        if value == '0':
+            self.limbs = [0]
+        elif base == 10:
+            limit = sys.get_int_max_str_digits()
+            if limit == 0 or len(value) <= limit:
+                # Delegate the parse to CPython's C bignum, which is far
+                # faster than any per-chunk Python loop.
+                self.limbs = _int_to_limbs(int(value))
+            else:
+                # Past the interpreter's str-conversion limit, fall back to
+                # parsing 9 decimal digits per step, one chunk per limb.
+                magnitude = [0]
+                first = len(value) % DEC_CHUNK or DEC_CHUNK
+                chunks = [value[:first]]
+                for start in range(first, len(value), DEC_CHUNK):
+                    chunks.append(value[start:start + DEC_CHUNK])
+                for chunk in chunks:
+                    magnitude = _limb_mul_small(magnitude, 10 ** len(chunk))
+                    magnitude = _limb_add(magnitude, [int(chunk)])
+                self.limbs = magnitude
+        else:
+            limit = sys.get_int_max_str_digits()
+            # Power-of-two bases are exempt from the str-conversion limit.
+            if base & (base - 1) == 0 or limit == 0 or len(value) <= limit:
+                self.limbs = _int_to_limbs(int(value, base))
+            else:
+                magnitude = [0]
+                for char in value:
+                    magnitude = _limb_mul_small(magnitude, base)
+                    magnitude = _limb_add(magnitude, [int(char, base)])
+                self.limbs = magnitude
+
+        if not isinstance(self.limbs, array):
+            self.limbs = array('I', self.limbs)
+        self._normalize()
+
+    def __str__(self):
+        sign = '-' if self.sign < 0 else ''
+        magnitude = self.limbs
+
+        if self.base == 10:
+            limit = sys.get_int_max_str_digits()
+            # ~9.03 decimal digits per 30-bit limb; stay clear of the limit.
+            if limit == 0 or len(magnitude) * 10 < limit:
+                return sign + str(_limbs_to_int(magnitude))
+            # Peel off 9 decimal digits per division step.
+            chunks = []
+            while _limb_compare(magnitude, [0]) > 0:
+                magnitude, rem = _limb_divmod_small(magnitude, DEC_CHUNK_BASE)
+                chunks.append(rem)
+            if not chunks:
+                return '0'
+            parts = [str(chunks[-1])]
+            for chunk in reversed(chunks[:-1]):
+                parts.append(f"{chunk:0{DEC_CHUNK}d}")
+            return sign + ''.join(parts)
+
+        digits = []
+        while _limb_compare(magnitude, [0]) > 0:
+            magnitude, rem = _limb_divmod_small(magnitude, self.base)
+            digits.append(DIGIT_CHARS[rem])
+        if not digits:
+            return '0'
+        return sign + ''.join(reversed(digits))
+
+    def __repr__(self):
+        return f"BigInt({str(self)})"
+
+    def to_int(self):
+        if self._int_cache is None:
+            self._int_cache = self.sign * _limbs_to_int(self.limbs)
+        return self._int_cache
+
+    def _normalize(self):
+        """Remove leading (most significant) zero limbs; zero is positive."""
+        while len(self.limbs) > 1 and self.limbs[-1] == 0:
+            self.limbs.pop()
+        if self._is_zero():
+            self.sign = 1
+        self._int_cache = None
+
+    def _is_zero(self):
+        return self.limbs[-1] == 0 and len(self.limbs) == 1
+
+    def _compare(self, other):
+        """Three-way limb-level comparison; no int conversion involved."""
+        if self.sign != other.sign:
+            return 1 if self.sign > other.sign else -1
+        cmp = _limb_compare(self.limbs, other.limbs)
+        return cmp if self.sign > 0 else -cmp
+
+    def __eq__(self, other):
+        if not isinstance(other, BigInt):
+            return NotImplemented
+        return self._compare(other) == 0
+
+    def __lt__(self, other):
+        if not isinstance(other, BigInt):
+            return NotImplemented
+        return self._compare(other) < 0
+
+    def __le__(self, other):
+        if not isinstance(other, BigInt):
+            return NotImplemented
+        return self._compare(other) <= 0
+
+    def __gt__(self, other):
+        if not isinstance(other, BigInt):
+            return NotImplemented
+        return self._compare(other) > 0
+
+    def __ge__(self, other):
+        if not isinstance(other, BigInt):
+            return NotImplemented
+        return self._compare(other) >= 0
+
+    def __hash__(self):
+        return hash(self.to_int())
+
+    def __abs__(self):
+        """Return the absolute value of the BigInt."""
+        return _from_limbs(1, self.limbs[:])
+
+    def __neg__(self):
+        """Return the negation of the BigInt."""
+        return _from_limbs(-self.sign, self.limbs[:])
+
+    def __add__(self, other):
+        if len(self.limbs) + len(other.limbs) <= SMALL_OP_LIMBS:
+            return BigInt(self.to_int() + other.to_int())
+
+        if self.sign == other.sign:
+            return _from_limbs(self.sign, _limb_add(self.limbs, other.limbs))
+
+        # Opposite signs: the larger magnitude decides the sign
+        cmp = _limb_compare(self.limbs, other.limbs)
+        if cmp == 0:
+            return BigInt(0)
+        if cmp > 0:
+            return _from_limbs(self.sign, _limb_sub(self.limbs, other.limbs))
+        return _from_limbs(other.sign, _limb_sub(other.limbs, self.limbs))
+
+    def __sub__(self, other):
+        if len(self.limbs) + len(other.limbs) <= SMALL_OP_LIMBS:
+            return BigInt(self.to_int() - other.to_int())
+
+        if self.sign != other.sign:
+            return _from_limbs(self.sign, _limb_add(self.limbs, other.limbs))
+
+        # Same signs: the larger magnitude decides the sign
+        cmp = _limb_compare(self.limbs, other.limbs)
+        if cmp == 0:
+            return BigInt(0)
+        if cmp > 0:
+            return _from_limbs(self.sign, _limb_sub(self.limbs, other.limbs))
+        return _from_limbs(-other.sign, _limb_sub(other.limbs, self.limbs))
+
+    def __mul__(self, other):
+        if len(self.limbs) + len(other.limbs) <= SMALL_OP_LIMBS:
+            return BigInt(self.to_int() * other.to_int())
+
+        return _from_limbs(self.sign * other.sign,
+                           _limb_mul(self.limbs, other.limbs))
+
+    def __floordiv__(self, other):
+        # Check for division by zero
+        if other._is_zero():
+            raise ZeroDivisionError("Division by zero")
+
+        quotient, _ = _limb_divmod(self.limbs, other.limbs)
+        return _from_limbs(self.sign * other.sign, quotient)
+
+    def __mod__(self, other):
+        # Check for modulo by zero
+        if other._is_zero():
+            raise ZeroDivisionError("Modulo by zero")
+
+        # The remainder takes the sign of the dividend
+        _, remainder = _limb_divmod(self.limbs, other.limbs)
+        return _from_limbs(self.sign, remainder)
+
+    def __pow__(self, exponent, modulus=None):
+        # Right-to-left binary exponentiation; with a modulus, every
+        # square/multiply is followed by a Barrett reduction instead of a
+        # full division.
+        if isinstance(exponent, int):
+            exponent = BigInt(exponent)
+        if exponent.sign < 0:
+            raise ValueError("Negative exponents are not supported")
+
+        e_limbs = exponent.limbs
+        base = self.limbs
+        sign = -1 if self.sign < 0 and e_limbs[0] & 1 else 1
+
+        if modulus is not None:
+            m_limbs = modulus.limbs
+            if modulus._is_zero():
+                raise ZeroDivisionError("Modulo by zero")
+            if _gmp is not None and len(m_limbs) >= GMP_THRESHOLD:
+                # GMP's mpz_powm does the whole loop natively.
+                return _from_limbs(sign, _gmp_powm(base, e_limbs, m_limbs))
+            # Precompute mu = floor(2^k / m) once; barrett_reduce then costs
+            # two multiplications per reduction instead of a division.
+            k = 2 * _limb_bitlen(m_limbs)
+            mu, _ = _limb_divmod([0] * (k // BASE_BITS) + [1 << (k % BASE_BITS)],
+                                 m_limbs)
+            _, base = _limb_divmod(base, m_limbs)
+            reduce = lambda x: _barrett_reduce(x, m_limbs, mu, k)
+        else:
+            reduce = lambda x: x
+
+        result = [1]
+        bits = _limb_bitlen(e_limbs)
+        for i in range(bits):
+            if (e_limbs[i // BASE_BITS] >> (i % BASE_BITS)) & 1:
+                result = reduce(_limb_mul(result, base))
+            if i + 1 < bits:
+                base = reduce(_limb_mul(base, base))
+
+        return _from_limbs(sign, result)
+
+    def factorial(self):
+        # Factorial via a balanced product tree: fact(lo, hi) splits the
+        # range in half so every multiplication has similarly sized
+        # operands, which is what lets Karatsuba/Toom-3 pay off.
+        if self.sign < 0:
+            raise ValueError("Factorial is not defined for negative numbers")
+
+        n = self.to_int()
+        if n < 20:
+            return BigInt(math.factorial(n))
+        return _prod_range(2, n)
+
+def _from_limbs(sign, limbs):
+    """Build a BigInt from a sign and a little-endian magnitude limb list."""
+    result = BigInt()
+    result.sign = sign
+    result.limbs = limbs if isinstance(limbs, array) else array('I', limbs)
+    result._normalize()
+    return result
+
+# Leaf blocks of the factorial product tree accumulate while the running
+# product still fits in one machine word, so the dense bottom of the tree
+# runs on CPython's fast small-int multiply.
+_WORD_LIMIT = 1 << 63
+
+def _prod_range(lo, hi):
+    """Product of the integers lo..hi (inclusive) as a balanced tree."""
+    if hi - lo < 32:
+        product = 1
+        block = 1
+        for i in range(lo, hi + 1):
+            if block <= (_WORD_LIMIT - 1) // i:
+                block *= i
+            else:
+                product *= block
+                block = i
+        return BigInt(product * block)
+    mid = (lo + hi) >> 1
+    return _prod_range(lo, mid) * _prod_range(mid + 1, hi)
+
+# 15 bytes = 120 bits = exactly 4 limbs, so limb lists convert to and from
+# Python ints through int.to_bytes/from_bytes in aligned 15-byte groups,
+# with only small-int shifts per group. The old one-limb-at-a-time shift
+# loops were O(n^2) because every big-int shift copies the whole number.
+_GROUP_BYTES = 15
+_GROUP_LIMBS = 4
+
+def _int_to_limbs(n):
+    """Convert a non-negative Python int to a little-endian limb list."""
+    if n == 0:
+        return [0]
+    nbytes = (n.bit_length() + 7) // 8
+    nbytes += -nbytes % _GROUP_BYTES
+    raw = n.to_bytes(nbytes, 'little')
+    limbs = []
+    for i in range(0, nbytes, _GROUP_BYTES):
+        group = int.from_bytes(raw[i:i + _GROUP_BYTES], 'little')
+        limbs.append(group & MASK)
+        limbs.append((group >> BASE_BITS) & MASK)
+        limbs.append((group >> (2 * BASE_BITS)) & MASK)
+        limbs.append(group >> (3 * BASE_BITS))
+    return _limb_strip(limbs)
+
+def _limbs_to_int(limbs):
+    """Convert a little-endian magnitude limb list to a Python int."""
+    raw = bytearray()
+    for i in range(0, len(limbs), _GROUP_LIMBS):
+        group = 0
+        for j, limb in enumerate(limbs[i:i + _GROUP_LIMBS]):
+            group |= limb << (j * BASE_BITS)
+        raw += group.to_bytes(_GROUP_BYTES, 'little')
+    return int.from_bytes(raw, 'little')
+
+def _limb_strip(limbs):
+    """Remove leading (most significant) zero limbs in place."""
+    while len(limbs) > 1 and limbs[-1] == 0:
+        limbs.pop()
+    return limbs
+
+def _limb_compare(a, b):
+    """Compare two little-endian magnitude limb lists."""
+    la, lb = len(a), len(b)
+    while la > 1 and a[la - 1] == 0:
+        la -= 1
+    while lb > 1 and b[lb - 1] == 0:
+        lb -= 1
+    if la != lb:
+        return 1 if la > lb else -1
+
+    for i in range(la - 1, -1, -1):
+        if a[i] != b[i]:
+            return 1 if a[i] > b[i] else -1
+    return 0
+
+def _limb_add(a, b):
+    """Add two little-endian magnitude limb lists."""
+    if len(a) < len(b):
+        a, b = b, a
+    result = []
+    carry = 0
+    # zip over the common prefix, then a straight-line pass over the tail:
+    # no per-iteration length checks in either loop.
+    for x, y in zip(a, b):
+        total = x + y + carry
+        carry = total >> BASE_BITS
+        result.append(total & MASK)
+    for x in a[len(b):]:
+        total = x + carry
+        carry = total >> BASE_BITS
+        result.append(total & MASK)
+    if carry:
+        result.append(carry)
+    return result
+
+def _limb_sub(a, b):
+    """Subtract little-endian magnitude limb lists; assumes a >= b."""
+    result = []
+    borrow = 0
+    for x, y in zip(a, b):
+        total = x - y - borrow
+        if total < 0:
+            total += BASE
+            borrow = 1
+        else:
+            borrow = 0
+        result.append(total)
+    for x in a[len(b):]:
+        total = x - borrow
+        if total < 0:
+            total += BASE
+            borrow = 1
+        else:
+            borrow = 0
+        result.append(total)
+    return _limb_strip(result)
+
+def _limb_mul_small(a, m):
+    """Multiply a little-endian magnitude limb list by a small int."""
+    result = []
+    carry = 0
+    for limb in a:
+        total = limb * m + carry
+        carry = total >> BASE_BITS
+        result.append(total & MASK)
+    while carry:
+        result.append(carry & MASK)
+        carry >>= BASE_BITS
+    return _limb_strip(result)
+
+@functools.lru_cache(maxsize=None)
+def _make_small_mul(nb):
+    """Generate an unrolled multiplier for a fixed short-operand size.
+
+    The returned function multiplies any limb list by an nb-limb operand
+    with the inner j-loop fully unrolled: the short operand's limbs are
+    unpacked to locals once and the loop body is a flat run of
+    multiply/mask/shift steps with no inner loop overhead.
+    """
+    b_names = ", ".join(f"b{j}" for j in range(nb))
+    lines = [
+        "def _mul(a, b):",
+        f"    out = [0] * (len(a) + {nb})",
+        f"    {b_names}{',' if nb == 1 else ''} = b",
+        "    for i, x in enumerate(a):",
+        f"        total = out[i] + x * b0",
+        f"        out[i] = total & {MASK}",
+        f"        carry = total >> {BASE_BITS}",
+    ]
+    for j in range(1, nb):
+        lines += [
+            f"        total = out[i + {j}] + x * b{j} + carry",
+            f"        out[i + {j}] = total & {MASK}",
+            f"        carry = total >> {BASE_BITS}",
+        ]
+    lines += [
+        f"        out[i + {nb}] = carry",
+        "    return out",
+    ]
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace["_mul"]
+
+# Largest short-operand size that gets an unrolled multiplier.
+SMALL_MUL_UNROLL = 4
+
+def _limb_mul(a, b):
+    """Multiply two little-endian magnitude limb lists."""
+    shorter = min(len(a), len(b))
+    if shorter <= SMALL_MUL_UNROLL:
+        if len(a) < len(b):
+            a, b = b, a
+        return _limb_strip(_make_small_mul(len(b))(a, b))
+    if _gmp is not None and shorter >= GMP_THRESHOLD:
+        return _gmp_mul(a, b)
+    if shorter < KARATSUBA_THRESHOLD:
+        return _limb_mul_schoolbook(a, b)
+    if shorter < TOOM3_THRESHOLD:
+        return _karatsuba(a, b)
+    if shorter >= NTT_THRESHOLD:
+        return _mul_ntt(a, b)
+    return _toom3(a, b)
+
+if numba is not None:
+    # Minimum operand size for the JIT kernel; below this the array
+    # conversions cost more than the interpreted loop.
+    NUMBA_MIN_LIMBS = 8
+
+    @numba.njit(cache=True)
+    def _mul_kernel(a, b, out):
+        """Native schoolbook kernel over int64 limb arrays.
+
+        int64 (rather than uint32/uint64) keeps Numba from promoting mixed
+        arithmetic to float; 30-bit limbs make every intermediate fit in
+        61 bits.
+        """
+        for i in range(a.shape[0]):
+            carry = 0
+            for j in range(b.shape[0]):
+                total = out[i + j] + a[i] * b[j] + carry
+                carry = total >> BASE_BITS
+                out[i + j] = total & MASK
+            out[i + b.shape[0]] += carry
+
+def _limb_mul_schoolbook(a, b):
+    """Schoolbook O(n*m) multiplication of magnitude limb lists."""
+    if numba is not None and min(len(a), len(b)) >= NUMBA_MIN_LIMBS:
+        out = numpy.zeros(len(a) + len(b), dtype=numpy.int64)
+        _mul_kernel(numpy.array(a, dtype=numpy.int64),
+                    numpy.array(b, dtype=numpy.int64), out)
+        return _limb_strip([int(v) for v in out])
+
+    result = [0] * (len(a) + len(b))
+    for i, a_limb in enumerate(a):
+        carry = 0
+        for j, b_limb in enumerate(b):
+            total = result[i + j] + a_limb * b_limb + carry
+            carry = total >> BASE_BITS
+            result[i + j] = total & MASK
+        result[i + len(b)] += carry
+    return _limb_strip(result)
+
+def _karatsuba(a, b):
+    """Karatsuba multiplication: three half-size products instead of four."""
+    m = max(len(a), len(b)) >> 1
+    a_lo, a_hi = a[:m], a[m:] or [0]
+    b_lo, b_hi = b[:m], b[m:] or [0]
+
+    z0 = _limb_mul(a_lo, b_lo)
+    z2 = _limb_mul(a_hi, b_hi)
+    z1 = _limb_sub(_limb_mul(_limb_add(a_lo, a_hi), _limb_add(b_lo, b_hi)),
+                   _limb_add(z0, z2))
+
+    # Shifting by whole limbs is just prepending zeros.
+    result = _limb_add(z0, [0] * m + z1)
+    result = _limb_add(result, [0] * (2 * m) + z2)
+    return result
+
+def _ntt(values, root, p, invert):
+    """In-place iterative Cooley-Tukey NTT modulo p (len must be 2^k)."""
+    n = len(values)
+    j = 0
+    for i in range(1, n):
+        bit = n >> 1
+        while j & bit:
+            j ^= bit
+            bit >>= 1
+        j |= bit
+        if i < j:
+            values[i], values[j] = values[j], values[i]
+
+    length = 2
+    while length <= n:
+        w = pow(root, (p - 1) // length, p)
+        if invert:
+            w = pow(w, p - 2, p)
+        half = length >> 1
+        for start in range(0, n, length):
+            wn = 1
+            for k in range(start, start + half):
+                u = values[k]
+                v = values[k + half] * wn % p
+                values[k] = (u + v) % p
+                values[k + half] = (u - v) % p
+                wn = wn * w % p
+        length <<= 1
+
+    if invert:
+        n_inv = pow(n, p - 2, p)
+        for i in range(n):
+            values[i] = values[i] * n_inv % p
+
+def _ntt_convolve(a, b, p, root):
+    """Cyclic convolution of limb sequences modulo an NTT prime."""
+    n = 1
+    while n < len(a) + len(b):
+        n <<= 1
+    fa = list(a) + [0] * (n - len(a))
+    fb = list(b) + [0] * (n - len(b))
+    _ntt(fa, root, p, False)
+    _ntt(fb, root, p, False)
+    for i in range(n):
+        fa[i] = fa[i] * fb[i] % p
+    _ntt(fa, root, p, True)
+    return fa
+
+def _mul_ntt(a, b):
+    """Multiply magnitude limb lists via NTT convolutions and CRT.
+
+    The convolution is computed modulo two 62-bit primes and the true
+    coefficients recovered by the Chinese remainder theorem before one
+    final carry-propagation pass back to 30-bit limbs.
+    """
+    (p1, g1), (p2, g2) = _NTT_PRIMES
+    r1 = _ntt_convolve(a, b, p1, g1)
+    r2 = _ntt_convolve(a, b, p2, g2)
+    p1_inv = pow(p1, p2 - 2, p2)
+
+    result = []
+    carry = 0
+    for v1, v2 in zip(r1, r2):
+        value = v1 + p1 * ((v2 - v1) * p1_inv % p2) + carry
+        carry = value >> BASE_BITS
+        result.append(value & MASK)
+    while carry:
+        result.append(carry & MASK)
+        carry >>= BASE_BITS
+    return _limb_strip(result)
+
+# Signed values for Toom-3 intermediates: (sign, magnitude limb list),
+# with sign in {1, -1} and zero always represented as (1, [0]).
+
+def _signed_add(x, y):
+    """Add two signed limb values."""
+    x_sign, x_limbs = x
+    y_sign, y_limbs = y
+    if x_sign == y_sign:
+        return x_sign, _limb_add(x_limbs, y_limbs)
+    cmp = _limb_compare(x_limbs, y_limbs)
+    if cmp == 0:
+        return 1, [0]
+    if cmp > 0:
+        return x_sign, _limb_sub(x_limbs, y_limbs)
+    return y_sign, _limb_sub(y_limbs, x_limbs)
+
+def _signed_sub(x, y):
+    """Subtract two signed limb values."""
+    return _signed_add(x, (-y[0], y[1]))
+
+def _signed_div_small(x, m):
+    """Exactly divide a signed limb value by a small positive int."""
+    quotient, _ = _limb_divmod_small(x[1], m)
+    return x[0], quotient
+
+def _toom3(a, b):
+    """Toom-Cook-3 multiplication: five third-size products instead of nine.
+
+    Evaluates both operands at the points 0, 1, -1, -2 and infinity and
+    interpolates with Bodrato's sequence, where the only divisions are
+    exact divisions by 2 and 3.
+    """
+    k = (max(len(a), len(b)) + 2) // 3
+    a0, a1, a2 = (1, a[:k]), (1, a[k:2 * k] or [0]), (1, a[2 * k:] or [0])
+    b0, b1, b2 = (1, b[:k]), (1, b[k:2 * k] or [0]), (1, b[2 * k:] or [0])
+
+    # Evaluation
+    pa = _signed_add(a0, a2)
+    pa1 = _signed_add(pa, a1)
+    pam1 = _signed_sub(pa, a1)
+    t = _signed_add(pam1, a2)
+    pam2 = _signed_sub(_signed_add(t, t), a0)
+    pb = _signed_add(b0, b2)
+    pb1 = _signed_add(pb, b1)
+    pbm1 = _signed_sub(pb, b1)
+    t = _signed_add(pbm1, b2)
+    pbm2 = _signed_sub(_signed_add(t, t), b0)
+
+    # Pointwise products (these recurse back through _limb_mul). The five
+    # sub-multiplications are independent, so for very large operands they
+    # run in parallel across worker processes.
+    pairs = ((a0, b0), (pa1, pb1), (pam1, pbm1), (pam2, pbm2), (a2, b2))
+    if len(a) + len(b) > PARALLEL_THRESHOLD and os.getpid() == _MAIN_PID:
+        products = _get_pool().map(_limb_mul, [x[1] for x, _ in pairs],
+                                   [y[1] for _, y in pairs])
+    else:
+        products = (_limb_mul(x[1], y[1]) for x, y in pairs)
+    r0, r1, rm1, rm2, rinf = (
+        (x[0] * y[0], p) for (x, y), p in zip(pairs, products))
+
+    # Interpolation (Bodrato)
+    t3 = _signed_div_small(_signed_sub(rm2, r1), 3)
+    t1 = _signed_div_small(_signed_sub(r1, rm1), 2)
+    t2 = _signed_sub(rm1, r0)
+    t3 = _signed_add(_signed_div_small(_signed_sub(t2, t3), 2),
+                     _signed_add(rinf, rinf))
+    t2 = _signed_sub(_signed_add(t2, t1), rinf)
+    t1 = _signed_sub(t1, t3)
+
+    # Recomposition: r0 + t1*X + t2*X^2 + t3*X^3 + rinf*X^4 with X = BASE^k
+    result = r0
+    for shift, part in ((k, t1), (2 * k, t2), (3 * k, t3), (4 * k, rinf)):
+        result = _signed_add(result, (part[0], [0] * shift + part[1]))
+    return result[1]
+
+def _limb_divmod_small(a, m):
+    """Divide a little-endian magnitude limb list by a small int."""
+    result = [0] * len(a)
+    remainder = 0
+    for i in range(len(a) - 1, -1, -1):
+        current = (remainder << BASE_BITS) + a[i]
+        result[i] = current // m
+        remainder = current % m
+    return _limb_strip(result), remainder
+
+def _limb_bitlen(a):
+    """Bit length of a little-endian magnitude limb list."""
+    i = len(a) - 1
+    while i > 0 and a[i] == 0:
+        i -= 1
+    return i * BASE_BITS + a[i].bit_length()
+
+def _limb_shift_left(a, bits):
+    """Shift a little-endian magnitude limb list left by a bit count."""
+    whole, rem = divmod(bits, BASE_BITS)
+    if rem == 0:
+        return [0] * whole + list(a)
+    result = [0] * whole
+    carry = 0
+    for limb in a:
+        total = (limb << rem) | carry
+        result.append(total & MASK)
+        carry = total >> BASE_BITS
+    if carry:
+        result.append(carry)
+    return result
+
+def _limb_shift_right(a, bits):
+    """Shift a little-endian magnitude limb list right by a bit count."""
+    whole, rem = divmod(bits, BASE_BITS)
+    a = a[whole:] or [0]
+    if rem == 0:
+        return _limb_strip(list(a))
+    result = []
+    for i in range(len(a)):
+        low = a[i] >> rem
+        high = a[i + 1] if i + 1 < len(a) else 0
+        result.append((low | (high << (BASE_BITS - rem))) & MASK)
+    return _limb_strip(result)
+
+def _barrett_reduce(x, m, mu, k):
+    """Reduce x mod m given the precomputed mu = floor(2^k / m).
+
+    Valid for 0 <= x < 2^k; the estimate q = (x * mu) >> k is off by at
+    most 2, so the correction loop runs at most twice.
+    """
+    q = _limb_shift_right(_limb_mul(x, mu), k)
+    r = _limb_sub(x, _limb_mul(q, m))
+    while _limb_compare(r, m) >= 0:
+        r = _limb_sub(r, m)
+    return r
+
+def _limb_divmod(a, b):
+    """Knuth Algorithm D division on little-endian magnitude limb lists.
+
+    Each quotient limb is estimated from the top two limbs of the running
+    remainder and the top limb of the (normalized) divisor; the estimate is
+    at most 2 too high and the rare overshoot is fixed by one add-back.
+    """
+    a = _limb_strip(list(a))
+    b = _limb_strip(list(b))
+    if _limb_compare(a, b) < 0:
+        return [0], a
+    if len(b) == 1:
+        quotient, remainder = _limb_divmod_small(a, b[0])
+        return quotient, [remainder]
+
+    # D1: normalize so the divisor's top limb has its high bit set.
+    shift = BASE_BITS - b[-1].bit_length()
+    u = _limb_shift_left(a, shift)
+    v = _limb_shift_left(b, shift)
+    n = len(v)
+    m = len(u) - n
+    u.append(0)
+    v1, v2 = v[-1], v[-2]
+    quotient = [0] * (m + 1)
+
+    for j in range(m, -1, -1):
+        # D3: estimate the quotient limb from the top limbs.
+        top = (u[j + n] << BASE_BITS) + u[j + n - 1]
+        qhat = top // v1
+        rhat = top - qhat * v1
+        if qhat > MASK:
+            rhat += (qhat - MASK) * v1
+            qhat = MASK
+        while qhat * v2 > (rhat << BASE_BITS) + u[j + n - 2]:
+            qhat -= 1
+            rhat += v1
+            if rhat > MASK:
+                break
+
+        # D4: subtract qhat * v from u[j:j+n+1] in a single pass.
+        carry = 0
+        borrow = 0
+        for i in range(n):
+            product = qhat * v[i] + carry
+            carry = product >> BASE_BITS
+            total = u[j + i] - (product & MASK) - borrow
+            if total < 0:
+                total += BASE
+                borrow = 1
+            else:
+                borrow = 0
+            u[j + i] = total
+        total = u[j + n] - carry - borrow
+
+        if total < 0:
+            # D6: qhat was one too large; add the divisor back.
+            qhat -= 1
+            carry = 0
+            for i in range(n):
+                total2 = u[j + i] + v[i] + carry
+                carry = total2 >> BASE_BITS
+                u[j + i] = total2 & MASK
+            u[j + n] = (total + BASE + carry) & MASK
+        else:
+            u[j + n] = total
+        quotient[j] = qhat
+
+    remainder = _limb_shift_right(u[:n], shift)
+    return _limb_strip(quotient), remainder
+
+# --- REPL expression parsing -------------------------------------------
+# A small Pratt parser instead of eval(): no code injection, no Python
+# compile cost per input, and compiled expression trees are cached.
+# Precedence follows Python: ** (right-associative) above unary minus,
+# then * // %, then + -; postfix ! (factorial) binds tightest.
+
+_BINARY_OPS = {
+    '+': (10, 11, lambda a, b: a + b),
+    '-': (10, 11, lambda a, b: a - b),
+    '*': (20, 21, lambda a, b: a * b),
+    '//': (20, 21, lambda a, b: a // b),
+    '%': (20, 21, lambda a, b: a % b),
+    '**': (31, 30, lambda a, b: a ** b),
+}
+
+def _tokenize(expr):
+    tokens = []
+    i = 0
+    while i < len(expr):
+        char = expr[i]
+        if char.isspace():
+            i += 1
+        elif char.isdigit():
+            j = i
+            while j < len(expr) and expr[j].isdigit():
+                j += 1
+            tokens.append(expr[i:j])
+            i = j
+        elif expr.startswith('**', i) or expr.startswith('//', i):
+            tokens.append(expr[i:i + 2])
+            i += 2
+        elif char in '+-*%()!':
+            tokens.append(char)
+            i += 1
+        else:
+            raise ValueError(f"Unexpected character {char!r}")
+    return tokens
+
+def _parse_expr(tokens, pos, min_bp):
+    if pos >= len(tokens):
+        raise ValueError("Unexpected end of expression")
+    token = tokens[pos]
+
+    if token[0].isdigit():
+        node = ('int', BigInt(token))
+        pos += 1
+    elif token == '-':
+        operand, pos = _parse_expr(tokens, pos + 1, 25)
+        node = ('neg', operand)
+    elif token == '(':
+        node, pos = _parse_expr(tokens, pos + 1, 0)
+        if pos >= len(tokens) or tokens[pos] != ')':
+            raise ValueError("Expected ')'")
+        pos += 1
+    else:
+        raise ValueError(f"Unexpected token {token!r}")
+
+    while pos < len(tokens):
+        token = tokens[pos]
+        if token == '!':
+            node = ('fact', node)
+            pos += 1
+        elif token in _BINARY_OPS:
+            lbp, rbp, _ = _BINARY_OPS[token]
+            if lbp <= min_bp:
+                break
+            rhs, pos = _parse_expr(tokens, pos + 1, rbp)
+            node = (token, node, rhs)
+        else:
+            break
+    return node, pos
+
+@functools.lru_cache(maxsize=256)
+def _compile_expr(expr):
+    tokens = _tokenize(expr)
+    node, pos = _parse_expr(tokens, 0, 0)
+    if pos != len(tokens):
+        raise ValueError(f"Unexpected token {tokens[pos]!r}")
+    return node
+
+def _eval_node(node):
+    kind = node[0]
+    if kind == 'int':
+        return node[1]
+    if kind == 'neg':
+        return -_eval_node(node[1])
+    if kind == 'fact':
+        return _eval_node(node[1]).factorial()
+    return _BINARY_OPS[kind][2](_eval_node(node[1]), _eval_node(node[2]))
+
+def evaluate(expr):
+    """Parse and evaluate a calculator expression, returning a BigInt."""
+    return _eval_node(_compile_expr(expr))
+
+def repl():
+    print("Welcome to BigInt REPL! Type 'exit' to quit.")
+    print("Operators: + - * // % ** ! (factorial) and parentheses.")
+    while True:
+        expr = input(">> ")
+        if expr == 'exit':
+            break
+        try:
+            result = evaluate(expr)
+            print(f"Result: {result}")
+        except Exception as e:
+            print(f"Error: {e}")
+
+if __name__ == "__main__":
+    repl()